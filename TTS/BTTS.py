@@ -4,8 +4,16 @@ On some filesystems (Linux) a file named 'BTTS.PY' is not found by
 `import BTTS` because Python looks for 'BTTS.py'. This wrapper loads the
 BTTS.PY file by path and re-exports the main symbols the GUI expects.
 """
+import importlib.machinery
+import importlib.util
 import os
-import runpy
+import re
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import soundfile as sf
 
 HERE = os.path.dirname(__file__)
 alt_path = os.path.join(HERE, "BTTS.PY")
@@ -13,10 +21,122 @@ alt_path = os.path.join(HERE, "BTTS.PY")
 if not os.path.exists(alt_path):
     raise ImportError(f"Could not find BTTS.PY at {alt_path}")
 
-# Execute BTTS.PY in its own namespace and re-export expected symbols
-ns = runpy.run_path(alt_path)
-create_emotional_tts = ns.get("create_emotional_tts")
-available_emotions = ns.get("available_emotions")
-if create_emotional_tts is None or available_emotions is None:
+# Match torch's intra/inter-op pools to OMP_NUM_THREADS (the GUI defaults it
+# to 1) so inference does not oversubscribe cores.
+try:
+    import torch
+    _threads = int(os.environ.get("OMP_NUM_THREADS", "1"))
+    torch.set_num_threads(_threads)
+    torch.set_num_interop_threads(_threads)
+except Exception:
+    pass
+
+
+class _ImplLoader(importlib.machinery.SourceFileLoader):
+    """SourceFileLoader that keeps BTTS.PY's bytecode apart from this file's.
+
+    BTTS.py and BTTS.PY both map to __pycache__/BTTS.<tag>.pyc, so each
+    import would find the other's bytecode stale and overwrite it. Bytecode
+    reads and writes are redirected to __pycache__/_btts_impl.<tag>.pyc.
+    """
+
+    def _bytecode_path(self, path):
+        head, tail = os.path.split(path)
+        if path != self.path and tail.startswith("BTTS."):
+            return os.path.join(head, "_btts_impl." + tail[len("BTTS."):])
+        return path
+
+    def get_data(self, path):
+        return super().get_data(self._bytecode_path(path))
+
+    def set_data(self, path, data, **kwargs):
+        return super().set_data(self._bytecode_path(path), data, **kwargs)
+
+
+# Import BTTS.PY as its own module and re-export expected symbols. The loader
+# is given explicitly because the upper-case suffix is not recognised as
+# source; it still reuses __pycache__ bytecode between runs.
+# It is registered under a private name so it does not replace this wrapper.
+_loader = _ImplLoader("_btts_impl", alt_path)
+_spec = importlib.util.spec_from_file_location("_btts_impl", alt_path, loader=_loader)
+_impl = importlib.util.module_from_spec(_spec)
+sys.modules["_btts_impl"] = _impl
+try:
+    _spec.loader.exec_module(_impl)
+except BaseException:
+    sys.modules.pop("_btts_impl", None)
+    raise
+_create_emotional_tts = getattr(_impl, "create_emotional_tts", None)
+available_emotions = getattr(_impl, "available_emotions", None)
+if _create_emotional_tts is None or available_emotions is None:
     raise ImportError("BTTS.PY does not define the expected symbols.")
-__all__ = ["create_emotional_tts", "available_emotions"]
+
+
+def create_emotional_tts(*args, fp16=False, **kwargs):
+    """Run BTTS.PY's create_emotional_tts, under FP16 autocast if requested.
+
+    Autocast only affects the torch model; the NumPy post-processing in
+    BTTS.PY keeps working in full precision. It is skipped without CUDA,
+    where float16 kernels are not faster.
+    """
+    if fp16:
+        try:
+            import torch
+            use_cuda = torch.cuda.is_available()
+        except ImportError:
+            use_cuda = False
+        if use_cuda:
+            with torch.autocast(device_type="cuda", dtype=torch.float16):
+                return _create_emotional_tts(*args, **kwargs)
+    return _create_emotional_tts(*args, **kwargs)
+
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_sentences(text):
+    """Split text on sentence-ending punctuation, dropping empty pieces."""
+    return [s for s in (p.strip() for p in _SENTENCE_RE.split(text)) if s]
+
+
+def _synthesize_sentence(sentence, emotion, **kwargs):
+    fd, tmp_path = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    try:
+        create_emotional_tts(sentence, emotion, tmp_path, **kwargs)
+        chunk, sr = sf.read(tmp_path, dtype="int16")
+    finally:
+        os.remove(tmp_path)
+    if chunk.ndim > 1:
+        chunk = chunk.mean(axis=1, dtype=np.float32).astype(np.int16)
+    return sr, chunk
+
+
+def create_emotional_tts_stream(text, emotion="neutral", max_workers=1, **kwargs):
+    """Synthesize text sentence by sentence, yielding (sample_rate, int16 chunk).
+
+    Every sentence goes through create_emotional_tts with the same keyword
+    arguments, so the emotion/post-processing settings stay identical across
+    chunks. The first chunk is available as soon as the first sentence is
+    done, instead of after the whole text.
+
+    With max_workers > 1 sentences are synthesized concurrently (torch
+    releases the GIL during inference); chunks are still yielded in order.
+    """
+    sentences = split_sentences(text)
+    if max_workers <= 1 or len(sentences) < 2:
+        for sentence in sentences:
+            yield _synthesize_sentence(sentence, emotion, **kwargs)
+        return
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(_synthesize_sentence, s, emotion, **kwargs) for s in sentences]
+        for future in futures:
+            yield future.result()
+
+
+__all__ = [
+    "create_emotional_tts",
+    "create_emotional_tts_stream",
+    "available_emotions",
+    "split_sentences",
+]
@@ -1,8 +1,21 @@
+import os
+
+# Keep BLAS/OpenMP from oversubscribing the CPU during inference; must be set
+# before numpy/torch are imported. Existing values in the environment win.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+
+import functools
+import hashlib
+import json
 import threading
 import time
-import os
+import queue
+import shutil
 import subprocess
 import traceback
+from collections import OrderedDict
 from datetime import datetime
 
 try:
@@ -11,12 +24,35 @@ try:
 except Exception:
     raise
 
-# Try to import the TTS helper
-try:
-    from BTTS import create_emotional_tts, available_emotions
-except Exception:
-    create_emotional_tts = None
-    available_emotions = ["neutral", "sad", "happy", "angry", "calm", "excited", "whisper"]
+available_emotions = ["neutral", "sad", "happy", "angry", "calm", "excited", "whisper"]
+
+# The TTS helper pulls in torch, which takes seconds to import; it is loaded
+# on first use (or by the warm-up thread) so the window shows up immediately.
+_btts = None
+
+
+def _import_btts():
+    """Import and return the BTTS module, or None if it cannot be imported."""
+    global _btts
+    if _btts is None:
+        try:
+            import BTTS
+        except Exception:
+            return None
+        _btts = BTTS
+    return _btts
+
+
+def _import_sounddevice():
+    """Import and return sounddevice, or None if playback is unavailable."""
+    try:
+        import sounddevice
+    except Exception:
+        return None
+    return sounddevice
+
+# where previously generated outputs are kept for reuse
+CACHE_DIR = os.path.expanduser("~/.cache/btts")
 
 
 class BTTSGui:
@@ -54,6 +90,20 @@ class BTTSGui:
                             pady=(8, 0)
                             )
 
+        # Stream sentence chunks to the sound card while the rest is synthesized
+        self.stream_var = tk.BooleanVar(value=True)
+        self.stream_chk = ttk.Checkbutton(
+            frm, text="Play while generating", variable=self.stream_var
+        )
+        self.stream_chk.grid(row=3, column=2, sticky="w", pady=(8, 0))
+
+        # Synthesize independent sentences on several cores at once
+        self.parallel_var = tk.BooleanVar(value=False)
+        self.parallel_chk = ttk.Checkbutton(
+            frm, text="Parallel sentences", variable=self.parallel_var
+        )
+        self.parallel_chk.grid(row=3, column=3, sticky="w", pady=(8, 0))
+
         # Custom model (dropdown with optional manual entry)
         ttk.Label(frm, text="Model:").grid(row=4, column=0, sticky="w")
         # sensible defaults
@@ -93,6 +143,11 @@ class BTTSGui:
         self.speed_entry = ttk.Entry(frm, textvariable=self.speed_var, width=8)
         self.speed_entry.grid(row=6, column=1, sticky="w")
 
+        # Half-precision inference (only takes effect on CUDA)
+        self.fp16_var = tk.BooleanVar(value=True)
+        self.fp16_chk = ttk.Checkbutton(frm, text="Fast (FP16)", variable=self.fp16_var)
+        self.fp16_chk.grid(row=6, column=2, sticky="w")
+
         # Pitch slider (semitones)
         ttk.Label(frm, text="Pitch shift (semitones):").grid(row=7, column=0, sticky="w")
         self.pitch_var = tk.DoubleVar(value=0.0)
@@ -142,16 +197,44 @@ class BTTSGui:
         self.brightness_val_lbl = ttk.Label(frm, textvariable=tk.StringVar(value=str(self.brightness_var.get())))
         self.brightness_val_lbl.grid(row=14, column=4, sticky="w")
 
-        # Wire up traces so value labels update live
+        # Inference device ("auto" picks CUDA when available)
+        ttk.Label(frm, text="Device:").grid(row=15, column=0, sticky="w")
+        self.device_var = tk.StringVar(value="auto")
+        self.device_cb = ttk.Combobox(
+            frm, textvariable=self.device_var, values=["auto", "cpu", "cuda", "mps"],
+            state="readonly", width=8
+        )
+        self.device_cb.grid(row=15, column=1, sticky="w")
+
+        # torch.compile the loaded model (first generation takes much longer)
+        self.compile_var = tk.BooleanVar(value=False)
+        self.compile_chk = ttk.Checkbutton(
+            frm, text="Compile model (slow first run)", variable=self.compile_var
+        )
+        self.compile_chk.grid(row=15, column=2, columnspan=2, sticky="w")
+
+        # Wire up traces so value labels update live. Slider drags fire a write
+        # per pixel, so updates are coalesced to at most one per 50ms.
         def _bind_var_display(var, label_var):
-            def _on_change(*_):
+            pending = False
+
+            def _flush():
+                nonlocal pending
+                pending = False
                 try:
                     val = var.get()
                 except Exception:
                     val = ''
                 label_var.set(str(round(float(val), 3)) if val != '' else '')
+
+            def _on_change(*_):
+                nonlocal pending
+                if pending:
+                    return
+                pending = True
+                self.root.after(50, _flush)
             var.trace_add('write', _on_change)
-            _on_change()
+            _flush()
 
         # create StringVars for labels and bind
         self._pitch_label_var = tk.StringVar()
@@ -199,9 +282,96 @@ class BTTSGui:
         root.columnconfigure(0, weight=1)
         root.rowconfigure(0, weight=1)
 
+        # loaded TTS instances, keyed by (model name, device, compiled) (load once, generate many)
+        self._tts_cache = {}
+        self._tts_cache_lock = threading.Lock()
+
+        # only one synthesis runs at a time; further requests queue behind it
+        self._synth_sem = threading.Semaphore(1)
+        self._jobs = 0
+        self._jobs_lock = threading.Lock()
+
+        # LRU of generated outputs keyed by synthesis parameters; only touched
+        # while holding _synth_sem, so it needs no lock of its own
+        self._synth_cache = OrderedDict()
+        self._synth_cache_max = 64
+        self._load_synth_cache()
+
+        # load the default model while the user is still typing
+        threading.Thread(target=self._warm_default_model, daemon=True).start()
+
+    @staticmethod
+    def _resolve_device(device):
+        if device != "auto":
+            return device
+        try:
+            import torch
+            return "cuda" if torch.cuda.is_available() else "cpu"
+        except Exception:
+            return "cpu"
+
+    @staticmethod
+    def _compile_tts(inst):
+        """Wrap the acoustic model and vocoder inference with torch.compile.
+
+        Compilation is lazy, so errors only surface on the first synthesis.
+        """
+        try:
+            import torch
+            synth = inst.synthesizer
+            # the synthesizer calls .inference() rather than forward(), so that
+            # is the method that gets compiled
+            synth.tts_model.inference = torch.compile(
+                synth.tts_model.inference, mode="reduce-overhead", fullgraph=False
+            )
+            if getattr(synth, 'vocoder_model', None) is not None:
+                synth.vocoder_model.inference = torch.compile(
+                    synth.vocoder_model.inference, mode="reduce-overhead"
+                )
+        except Exception:
+            pass
+
+    def _get_tts(self, model_name, device="auto", compile=False):
+        """Return a cached TTS instance for model_name on device, loading it on first use.
+
+        Compiled and plain instances are cached separately, so unticking
+        "Compile model" goes back to the uncompiled model.
+        """
+        device = self._resolve_device(device)
+        key = (model_name, device, bool(compile))
+        with self._tts_cache_lock:
+            inst = self._tts_cache.get(key)
+            if inst is None:
+                from TTS.api import TTS
+                inst = TTS(model_name=model_name)
+                if device != "cpu":
+                    inst = inst.to(device)
+                if compile:
+                    self._compile_tts(inst)
+                self._tts_cache[key] = inst
+            return inst
+
+    def _drop_compiled_tts(self, model_name, device="auto"):
+        """Forget the compiled instance of model_name, e.g. after it failed."""
+        with self._tts_cache_lock:
+            self._tts_cache.pop((model_name, self._resolve_device(device), True), None)
+
+    def _warm_default_model(self):
+        """Load the default child model and run one tiny inference."""
+        try:
+            _import_btts()
+            # models Coqui cannot build by name are loaded by BTTS.PY per job
+            # and cannot be kept warm; there is nothing to do for them here
+            inst = self._get_tts("C3Imaging/child_tts_fastpitch")
+            # first inference pays for lazy kernel init/autotuning; do it now
+            with self._synth_sem:
+                inst.tts(text="Hi.")
+        except Exception:
+            pass
+
     def set_status(self, text):
-        self.status_var.set(text)
-        self.root.update_idletasks()
+        # schedule on the Tk loop instead of forcing a redraw from worker threads
+        self.root.after(0, self.status_var.set, text)
 
     def on_model_choice_changed(self):
         sel = self.model_choice_var.get().strip()
@@ -222,20 +392,42 @@ class BTTSGui:
             model_name = "tts_models/en/vctk/vits"
 
         # populate speakers in background
-        th = threading.Thread(target=self._populate_speakers_thread, args=(model_name,), daemon=True)
+        th = threading.Thread(
+            target=self._populate_speakers_thread, args=(model_name, self.device_var.get()), daemon=True
+        )
         th.start()
 
-    def _populate_speakers_thread(self, model_name):
+    def _populate_speakers_thread(self, model_name, device="auto"):
+        # speaker lists are cached on disk so flipping models (or restarting)
+        # does not need a full model load just to read metadata
+        cache_path = os.path.join(
+            CACHE_DIR, f"spk_{hashlib.md5(model_name.encode('utf-8')).hexdigest()}.json"
+        )
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                spk = json.load(f)
+            self.root.after(0, lambda: self._set_speakers_ui(spk))
+            self.set_status(f"Loaded {len(spk)} speakers from cache" if spk else "No speakers available for this model")
+            return
+        except Exception:
+            pass
+
         # attempt to initialize the TTS probe and read speakers
         self.set_status(f"Probing model for speakers: {model_name}")
         try:
-            from TTS.api import TTS
             tts = None
             try:
-                tts = TTS(model_name=model_name)
+                tts = self._get_tts(model_name, device)
             except Exception:
                 # try fallback without raising
                 tts = None
+            if tts is not None:
+                try:
+                    os.makedirs(CACHE_DIR, exist_ok=True)
+                    with open(cache_path, "w", encoding="utf-8") as f:
+                        json.dump([s.strip() for s in (getattr(tts, 'speakers', None) or [])], f)
+                except Exception:
+                    pass
             if tts and getattr(tts, 'speakers', None):
                 spk = [s.strip() for s in tts.speakers]
                 # update UI in main thread
@@ -273,15 +465,17 @@ class BTTSGui:
             messagebox.showerror("Open failed", str(e))
 
     def on_generate(self):
-        if create_emotional_tts is None:
-            messagebox.showerror("BTTS import error", "Could not import create_emotional_tts from BTTS.py. Make sure BTTS.py is in the same folder and imports without prompts.")
-            return
         text = self.txt.get("1.0", "end").strip()
         if not text:
             messagebox.showerror("No text", "Please enter text to synthesize.")
             return
         emotion = self.emotion_var.get()
         child_mode = bool(self.child_var.get())
+        stream = bool(self.stream_var.get())
+        fp16 = bool(self.fp16_var.get())
+        parallel = bool(self.parallel_var.get())
+        device = self.device_var.get()
+        compile_model = bool(self.compile_var.get())
         # resolve selected model
         sel = self.model_choice_var.get().strip()
         if sel.startswith("C3Imaging/"):
@@ -314,6 +508,11 @@ class BTTSGui:
         reverb_amt = float(self.reverb_var.get()) if hasattr(self, 'reverb_var') else 0.0
         brightness = float(self.brightness_var.get()) if hasattr(self, 'brightness_var') else 0.0
 
+        # keep the button disabled while any job is queued or running
+        with self._jobs_lock:
+            self._jobs += 1
+        self.generate_btn.config(state="disabled")
+
         th = threading.Thread(
             target=self._generate_thread,
             args=(
@@ -329,26 +528,179 @@ class BTTSGui:
                 trem_depth,
                 reverb_amt,
                 brightness,
+                stream,
+                fp16,
+                parallel,
+                device,
+                compile_model,
             ),
             daemon=True,
         )
         th.start()
 
-    def _generate_thread(self, text, emotion, out, model_name, child_mode, global_speed, pitch_shift, energy, trem_rate, trem_depth, reverb_amt, brightness):
+    def _load_synth_cache(self):
+        """Index outputs left by earlier sessions, oldest first, and trim to the cap."""
+        entries = []
+        try:
+            for entry in os.scandir(CACHE_DIR):
+                if entry.name.endswith(".wav"):
+                    try:
+                        entries.append((entry.stat().st_mtime, entry.name[:-4], entry.path))
+                    except OSError:
+                        pass
+        except OSError:
+            return
+        for _, key, path in sorted(entries):
+            self._synth_cache[key] = path
+        self._evict_synth_cache()
+
+    def _synth_cache_lookup(self, key):
+        """Return the cached WAV path for key, or None on a miss."""
+        path = os.path.join(CACHE_DIR, f"{key}.wav")
+        if key in self._synth_cache:
+            if os.path.exists(path):
+                self._synth_cache.move_to_end(key)
+                # the mtime orders the index when the next session loads it
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+                return path
+            del self._synth_cache[key]
+        elif os.path.exists(path):
+            # left over from a previous session
+            self._synth_cache[key] = path
+            self._evict_synth_cache()
+            return path
+        return None
+
+    def _synth_cache_store(self, key, out):
+        path = os.path.join(CACHE_DIR, f"{key}.wav")
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            shutil.copy(out, path)
+        except Exception:
+            return
+        self._synth_cache[key] = path
+        self._evict_synth_cache()
+
+    def _evict_synth_cache(self):
+        while len(self._synth_cache) > self._synth_cache_max:
+            _, old_path = self._synth_cache.popitem(last=False)
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+
+    def _finish_job(self):
+        with self._jobs_lock:
+            self._jobs -= 1
+            idle = self._jobs == 0
+        if idle:
+            self.generate_btn.config(state="normal")
+
+    def _synthesize_chunked(self, text, emotion, out, play=False, **kwargs):
+        """Synthesize `text` sentence by sentence into a single WAV at `out`.
+
+        With `play` set, chunks are also sent to the sound card as soon as
+        they are ready.
+        """
+        import soundfile as sf
+
+        sd = _import_sounddevice() if play else None
+
+        # playback runs in its own thread so the next sentence is synthesized
+        # while the current one is still playing
+        chunks = queue.Queue()
+
+        def _player(sr):
+            with sd.OutputStream(samplerate=sr, channels=1, dtype="int16") as stream:
+                while True:
+                    chunk = chunks.get()
+                    if chunk is None:
+                        break
+                    stream.write(chunk)
+
+        total = len(_btts.split_sentences(text))
+        player = None
+        writer = None
+        try:
+            self.set_status(f"Sentence 1/{total}...")
+            for i, (sr, chunk) in enumerate(_btts.create_emotional_tts_stream(text, emotion, **kwargs)):
+                if writer is None:
+                    writer = sf.SoundFile(out, "w", samplerate=sr, channels=1, subtype="PCM_16")
+                    if sd is not None:
+                        player = threading.Thread(target=_player, args=(sr,), daemon=True)
+                        player.start()
+                writer.write(chunk)
+                if player is not None:
+                    chunks.put(chunk)
+                if i + 1 < total:
+                    self.set_status(f"Sentence {i + 2}/{total}...")
+        finally:
+            if writer is not None:
+                writer.close()
+            if player is not None:
+                chunks.put(None)
+                player.join()
+
+    def _generate_thread(self, text, emotion, out, model_name, child_mode, global_speed, pitch_shift, energy, trem_rate, trem_depth, reverb_amt, brightness, stream=False, fp16=False, parallel=False, device="auto", compile_model=False):
+        if not self._synth_sem.acquire(blocking=False):
+            self.set_status("Queued...")
+            self._synth_sem.acquire()
         try:
-            self.generate_btn.config(state="disabled")
             self.set_status("Starting generation...")
             # choose model_name fallback
             chosen_model = model_name or ("C3Imaging/child_tts_fastpitch" if child_mode else "tts_models/en/vctk/vits")
+            key = hashlib.md5(
+                f"{text}|{emotion}|{chosen_model}|{child_mode}|{global_speed}|{pitch_shift}|{energy}|"
+                f"{trem_rate}|{trem_depth}|{reverb_amt}|{brightness}|{fp16}".encode("utf-8")
+            ).hexdigest()
+            cached = self._synth_cache_lookup(key)
+            if cached is not None:
+                try:
+                    shutil.copy(cached, out)
+                except Exception:
+                    # synthesize instead; a bad output path is then reported
+                    # by the usual error handling below
+                    pass
+                else:
+                    self.set_status(f"Done (cached). Saved to {out}")
+                    return
+            if _btts is None:
+                self.set_status("Loading model...")
+            btts = _import_btts()
+            if btts is None:
+                self.set_status("BTTS import failed")
+                messagebox.showerror("BTTS import error", "Could not import create_emotional_tts from BTTS.py. Make sure BTTS.py is in the same folder and imports without prompts.")
+                return
             self.set_status(f"Initializing model: {chosen_model}")
             # call the create_emotional_tts function
             try:
-                create_emotional_tts(
+                try:
+                    inst = self._get_tts(chosen_model, device, compile=compile_model)
+                except Exception:
+                    # Coqui cannot build every model from its name (e.g. the
+                    # default child model); let BTTS.PY load it itself
+                    inst = None
+                # the chunked path calls BTTS.PY once per sentence through a
+                # temp WAV, so it is only used when there is something to play
+                # or split, and only with a cached instance (otherwise every
+                # sentence would load the model again)
+                play = inst is not None and stream and _import_sounddevice() is not None
+                if inst is not None and (play or len(btts.split_sentences(text)) > 1):
+                    workers = min(4, (os.cpu_count() or 2) // 2) if parallel else 1
+                    synth = functools.partial(
+                        self._synthesize_chunked, play=play, max_workers=max(1, workers)
+                    )
+                else:
+                    synth = btts.create_emotional_tts
+                synth(
                     text,
                     emotion,
                     out,
                     speaker=None,
-                    tts_instance=None,
+                    tts_instance=inst,
                     speaker_gender=None,
                     global_speed=global_speed,
                     model_name=chosen_model,
@@ -359,33 +711,48 @@ class BTTSGui:
                     tremolo_depth=trem_depth,
                     reverb_amount=reverb_amt,
                     brightness=brightness,
+                    fp16=fp16,
                 )
-                self.set_status(f"Done. Saved to {out}")
+                self._synth_cache_store(key, out)
+                notes = []
+                if stream and not play:
+                    reason = "sounddevice is not installed" if inst is not None else "model is not cached"
+                    notes.append(f"no playback: {reason}")
+                if inst is None and device != "auto":
+                    # the device is applied through the cached instance only;
+                    # BTTS.PY picks its own device when it loads the model
+                    notes.append(f"device '{device}' not applied to this model")
+                self.set_status(f"Done. Saved to {out}" + (f" ({'; '.join(notes)})" if notes else ""))
             except Exception as e:
                 # fallback: if child-mode and chosen_model failed, try vctk/vits + post-processing
                 tb = traceback.format_exc()
+                if compile_model:
+                    # compile errors only show up here; don't reuse the broken instance
+                    self._drop_compiled_tts(chosen_model, device)
                 self.set_status("Generation failed: falling back to vctk approximation...")
                 try:
                     # fallback to vctk model
-                    create_emotional_tts(
+                    btts.create_emotional_tts(
                         text,
                         emotion,
                         out,
                         speaker=None,
-                        tts_instance=None,
+                        tts_instance=self._get_tts("tts_models/en/vctk/vits", device),
                         speaker_gender=None,
                         global_speed=global_speed,
                         model_name="tts_models/en/vctk/vits",
                         child_mode=True,
                         pitch_shift=pitch_shift,
                         energy=energy,
+                        fp16=fp16,
                     )
                     self.set_status(f"Done with fallback. Saved to {out}")
                 except Exception as e2:
                     self.set_status("All generation attempts failed")
                     messagebox.showerror("Generation failed", f"Errors:\n{tb}\n{traceback.format_exc()}")
         finally:
-            self.generate_btn.config(state="normal")
+            self._synth_sem.release()
+            self._finish_job()
 
 
 if __name__ == "__main__":
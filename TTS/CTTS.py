@@ -1,41 +1,308 @@
 # Interactive Emotional TTS - Select Emotion and Enter Text
-import librosa
+import csv
+import functools
+import hashlib
 import soundfile as sf
 import numpy as np
-import tempfile
-import os
 import logging
+import os
+import queue
+import re
+import shutil
+import threading
 import time
-from TTS.api import TTS
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+
+
+# Parsed speaker_IDs.txt, reused until the file's modification time changes
+_GENDER_CACHE = {"path": None, "mtime": None, "data": {}}
 
 
 def load_speaker_genders(path="speaker_audios/speaker_IDs.txt"):
     """Return a dict mapping speaker ID (normalized) -> gender string."""
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return {}
+    if _GENDER_CACHE["path"] == path and _GENDER_CACHE["mtime"] == mtime:
+        return _GENDER_CACHE["data"]
+
     genders = {}
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            # skip header if present
-            for i, line in enumerate(f):
-                line = line.strip()
-                if not line:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for i, row in enumerate(csv.reader(f)):
+                if not row:
                     continue
-                if i == 0 and line.lower().startswith("id,"):
+                # skip header if present
+                if i == 0 and row[0].strip().lower() == "id" and len(row) > 1:
                     continue
-                parts = line.split(",")
-                if len(parts) >= 2:
-                    sid = parts[0].strip()
-                    g = parts[1].strip()
+                if len(row) >= 2:
+                    sid = row[0].strip()
+                    g = row[1].strip()
                     if sid:
                         genders[sid.upper()] = g
-    except FileNotFoundError:
-        pass
     except Exception:
         pass
+    _GENDER_CACHE.update(path=path, mtime=mtime, data=genders)
     return genders
 
 # Configure basic logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 
+# Loaded TTS models keyed by model name; loading weights dominates the cost of
+# short utterances, so each model is loaded once per process.
+_TTS_CACHE = {}
+
+
+def _get_tts(model_name="tts_models/en/vctk/vits"):
+    """Return a cached TTS instance for model_name, loading it on first use."""
+    tts = _TTS_CACHE.get(model_name)
+    if tts is None:
+        # imported here: TTS/torch take seconds to import and are not needed
+        # for load_speaker_genders or available_emotions
+        import torch
+        from TTS.api import TTS
+        tts = TTS(model_name=model_name)
+        tts.to("cuda" if torch.cuda.is_available() else "cpu")
+        synthesizer = getattr(tts, "synthesizer", None)
+        for module in (getattr(synthesizer, "tts_model", None), getattr(synthesizer, "vocoder_model", None)):
+            if module is not None and hasattr(module, "eval"):
+                module.eval()
+        # one throwaway inference so lazy CUDA/phonemizer init happens now,
+        # not on the caller's first real request
+        try:
+            speakers = getattr(tts, "speakers", None)
+            with torch.inference_mode():
+                tts.tts(text="a.", speaker=speakers[0] if speakers else None)
+        except Exception:
+            pass
+        _TTS_CACHE[model_name] = tts
+    return tts
+
+
+@functools.lru_cache(maxsize=1)
+def _gpu_effects_available():
+    """True when torchaudio is installed and a CUDA device is present."""
+    try:
+        import torch
+        import torchaudio  # noqa: F401
+        return torch.cuda.is_available()
+    except Exception:
+        return False
+
+
+def _gpu_shift_and_stretch(audio, sr, n_steps, rate, n_fft=2048, hop_length=512):
+    """GPU version of the fused pitch/speed change (one cuFFT STFT, one resample)."""
+    import torch
+    import torchaudio
+
+    ratio = 2.0 ** (n_steps / 12.0)
+    stretch = rate / ratio
+    wav = torch.from_numpy(np.ascontiguousarray(audio, dtype=np.float32)).cuda()
+    if abs(stretch - 1.0) > 0.01:
+        window = torch.hann_window(n_fft, device=wav.device)
+        spec = torch.stft(wav, n_fft, hop_length=hop_length, window=window, return_complex=True)
+        stretcher = torchaudio.transforms.TimeStretch(
+            hop_length=hop_length, n_freq=n_fft // 2 + 1
+        ).to(wav.device)
+        spec = stretcher(spec, stretch)
+        wav = torch.istft(
+            spec, n_fft, hop_length=hop_length, window=window,
+            length=int(round(len(audio) / stretch)),
+        )
+    if n_steps:
+        # resample by 1/ratio, expressed as a small integer frequency ratio
+        frac = Fraction(ratio).limit_denominator(100)
+        wav = torchaudio.functional.resample(
+            wav, orig_freq=frac.numerator, new_freq=frac.denominator
+        )
+    return wav.cpu().numpy()
+
+
+def _shift_and_stretch(audio, sr, n_steps, rate=1.0, fuse=True):
+    """Shift pitch by n_steps semitones and change speed by rate.
+
+    librosa's pitch_shift is a time_stretch followed by a resample, so calling
+    it and then time_stretch runs the STFT/phase vocoder twice. The fused path
+    does one time_stretch(rate / ratio) and one resample, which yields the
+    same pitch and duration. Speed changes are skipped for clips under a
+    second, as they always were. With CUDA and torchaudio available the
+    fused path runs on the GPU.
+    """
+    # librosa pulls in numba/llvmlite; only import it once effects are needed
+    import librosa
+
+    if len(audio) <= sr or rate <= 0:
+        rate = 1.0
+    if not fuse:
+        if n_steps:
+            audio = librosa.effects.pitch_shift(audio, sr=sr, n_steps=n_steps, res_type="soxr_hq")
+        if abs(rate - 1.0) > 0.01:
+            audio = librosa.effects.time_stretch(audio, rate=rate)
+        return audio
+    if _gpu_effects_available() and len(audio) > 2048:
+        return _gpu_shift_and_stretch(audio, sr, n_steps, rate)
+    ratio = 2.0 ** (n_steps / 12.0)
+    stretch = rate / ratio
+    if abs(stretch - 1.0) > 0.01:
+        audio = librosa.effects.time_stretch(audio, rate=stretch)
+    if n_steps:
+        import soxr
+        audio = soxr.resample(audio, float(sr) * ratio, sr, quality="HQ")
+    return audio
+
+
+# Finished outputs of create_emotional_tts, keyed by a hash of the request;
+# the least recently used files beyond _OUTPUT_CACHE_MAX are deleted
+_OUTPUT_CACHE_DIR = os.path.expanduser("~/.cache/ctts")
+_OUTPUT_CACHE_MAX = 64
+
+# Sentence boundaries used to split long text for streamed synthesis
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+# Per-emotion effect settings: (pitch shift in semitones, speed multiplier
+# applied on top of global_speed or None to keep the speed, gain, description)
+_EMOTION_PARAMS = {
+    "sad": (-3, 0.7, 0.8, "lower pitch, slower speed, quieter volume"),
+    "happy": (2, 1.2, 1.1, "higher pitch, faster speed, brighter tone"),
+    "angry": (-2, 1.1, 1.2, "lower pitch, faster speed, louder volume"),
+    "calm": (-1, 0.8, 0.9, "lower pitch, slower speed, softer volume"),
+    "excited": (3, 1.3, 1.15, "higher pitch, faster speed, louder volume"),
+    "whisper": (-1, None, 0.5, "lower pitch, much quieter volume"),
+    "neutral": (0, None, 1.0, "no modifications"),
+}
+
+
+def _apply_effects(audio, sr, n_steps, rate, gain, fuse=True):
+    """Apply one emotion's pitch/speed change and gain to audio."""
+    audio = _shift_and_stretch(audio, sr, n_steps, rate, fuse=fuse)
+    # keep the buffer float32 so the gain and clip below never upcast/copy
+    if audio.dtype != np.float32:
+        audio = audio.astype(np.float32)
+    if gain != 1.0:
+        audio *= gain
+    return audio
+
+
+def _prune_output_cache():
+    """Delete the least recently used cached outputs beyond _OUTPUT_CACHE_MAX."""
+    entries = []
+    try:
+        for entry in os.scandir(_OUTPUT_CACHE_DIR):
+            if entry.name.endswith(".wav"):
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    pass
+    except OSError:
+        return
+    if len(entries) <= _OUTPUT_CACHE_MAX:
+        return
+    entries.sort()
+    for _, path in entries[:-_OUTPUT_CACHE_MAX]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _load_tts(tts_instance=None, model_name="tts_models/en/vctk/vits"):
+    """Return tts_instance, or the cached model for model_name."""
+    # Load or reuse TTS model (may download weights on first run)
+    logging.info("Loading TTS model...")
+    if tts_instance is not None:
+        tts = tts_instance
+    else:
+        try:
+            tts = _get_tts(model_name)
+        except Exception as e:
+            logging.error("Failed to initialize TTS model: %s", e)
+            raise
+    return tts
+
+
+def _default_speaker(tts, speaker=None):
+    """Use the provided speaker, else the model's first speaker or None."""
+    if speaker is None and getattr(tts, "speakers", None):
+        try:
+            speaker = tts.speakers[0]
+        except Exception:
+            speaker = None
+    return speaker
+
+
+def _synthesize(tts, text, speaker=None):
+    """Run the TTS model and return (mono float32 samples, sample rate)."""
+    import torch
+
+    # Generate basic speech directly as samples (no WAV round-trip on disk);
+    # inference_mode skips autograd bookkeeping for the forward pass
+    try:
+        logging.info("Generating speech...")
+        with torch.inference_mode():
+            try:
+                wav = tts.tts(text=text, speaker=speaker)
+            except TypeError:
+                # some TTS versions accept different param names
+                wav = tts.tts(text=text)
+    except Exception as e:
+        logging.error("Error generating TTS audio: %s", e)
+        raise
+    audio = np.ascontiguousarray(wav, dtype=np.float32)
+    # tts_to_file's save_wav peak-normalized before the effects ran; keep
+    # that level so the emotion gains apply to the same baseline
+    audio *= 1.0 / max(0.01, float(np.abs(audio).max()))
+    sr = tts.synthesizer.output_sample_rate
+
+    # Ensure audio is mono (librosa effects expect 1D array); stereo is the
+    # common case and is averaged as (L + R) * 0.5 in float32
+    if audio.ndim == 2 and audio.shape[1] == 2:
+        audio = np.add(audio[:, 0], audio[:, 1], dtype=np.float32)
+        audio *= 0.5
+    elif audio.ndim > 1:
+        audio = audio.mean(axis=1, dtype=np.float32)
+    return audio, sr
+
+
+def _emotional_effects(audio, sr, emotion, global_speed=1.0, fuse=True):
+    """Apply the effects for emotion (unknown names mean neutral)."""
+    emotion_key = emotion.lower()
+    if emotion_key not in _EMOTION_PARAMS:
+        emotion_key = "neutral"
+    n_steps, rate_mult, gain, description = _EMOTION_PARAMS[emotion_key]
+    rate = rate_mult * float(global_speed) if rate_mult is not None else 1.0
+    audio = _apply_effects(audio, sr, n_steps, rate, gain, fuse=fuse)
+    print(f"Applied {emotion_key} emotion: {description}")
+    return audio
+
+
+def _to_pcm16(audio):
+    """Scale, clip and round float audio in [-1, 1] to int16 samples.
+
+    Done in place on the float32 buffer, so libsndfile only has to copy
+    ready-made 16-bit samples instead of converting floats itself.
+    """
+    # ensure float32 (no copy when it already is)
+    audio = np.ascontiguousarray(audio, dtype=np.float32)
+    np.multiply(audio, 32767.0, out=audio)
+    np.clip(audio, -32768.0, 32767.0, out=audio)
+    np.rint(audio, out=audio)
+    return audio.astype(np.int16)
+
+
+def _write_output(output_file, audio, sr):
+    """Clip audio to [-1, 1] and save it as 16-bit PCM."""
+    audio = _to_pcm16(audio)
+
+    try:
+        sf.write(output_file, audio, sr, subtype='PCM_16')
+    except TypeError:
+        # older soundfile versions may not accept subtype kwarg
+        sf.write(output_file, audio, sr)
+
+    logging.info("Emotional TTS saved as: %s", output_file)
+
 
 def create_emotional_tts(
     text,
@@ -45,6 +312,9 @@ def create_emotional_tts(
     tts_instance=None,
     speaker_gender=None,
     global_speed=1.0,
+    model_name="tts_models/en/vctk/vits",
+    fuse_effects=True,
+    use_cache=True,
 ):
     """
     Create emotional TTS with different emotions using post-processing
@@ -56,156 +326,230 @@ def create_emotional_tts(
     - calm: lower pitch, slower speed, softer
     - excited: higher pitch, faster speed, louder
     - neutral: normal settings
+
+    fuse_effects applies pitch and speed changes in a single phase-vocoder
+    pass; set it to False to use librosa's separate pitch_shift/time_stretch.
+
+    With use_cache, results are kept in ~/.cache/ctts (the 64 most recently
+    used) and a repeated request (same text, emotion, speaker, speed and
+    model) is served by copying the earlier file instead of running the
+    model. A tts_instance without a model_name is never cached, since its
+    output cannot be told apart from another model's.
     """
     
-    # Load or reuse TTS model (may download weights on first run)
-    logging.info("Loading TTS model...")
-    if tts_instance is not None:
-        tts = tts_instance
-    else:
+    cache_path = None
+    cache_model = model_name if tts_instance is None else getattr(tts_instance, "model_name", None)
+    if use_cache and cache_model:
+        key = hashlib.blake2b(
+            f"{text}|{emotion.lower()}|{speaker}|{float(global_speed)}|{cache_model}|{fuse_effects}".encode("utf-8"),
+            digest_size=16,
+        ).hexdigest()
+        cache_path = os.path.join(_OUTPUT_CACHE_DIR, f"{key}.wav")
         try:
-            tts = TTS(model_name="tts_models/en/vctk/vits")
-        except Exception as e:
-            logging.error("Failed to initialize TTS model: %s", e)
-            raise
+            shutil.copyfile(cache_path, output_file)
+        except OSError:
+            # a miss, or pruned by another process meanwhile: synthesize
+            pass
+        else:
+            # mark as recently used so pruning keeps it
+            try:
+                os.utime(cache_path)
+            except OSError:
+                pass
+            logging.info("Emotional TTS reused from cache: %s", output_file)
+            return output_file
 
-    # Choose a speaker (use provided speaker, else first available or None)
-    if speaker is None and getattr(tts, "speakers", None):
-        try:
-            speaker = tts.speakers[0]
-        except Exception:
-            speaker = None
+    tts = _load_tts(tts_instance, model_name)
+    speaker = _default_speaker(tts, speaker)
     logging.info("Using speaker: %s (gender=%s)", speaker, speaker_gender)
 
-    # Generate basic speech into a secure temporary file
-    tf = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
-    temp_path = tf.name
-    tf.close()
-    try:
-        logging.info("Generating speech to temporary file %s...", temp_path)
-        try:
-            tts.tts_to_file(text=text, speaker=speaker, file_path=temp_path)
-        except TypeError:
-            # some TTS versions accept different param names
-            tts.tts_to_file(text=text, file_path=temp_path)
-
-        # Load the generated audio
-        audio, sr = librosa.load(temp_path, sr=None)
-    except Exception as e:
-        logging.error("Error generating or loading TTS audio: %s", e)
-        # cleanup temp file if exists
-        try:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-        except Exception:
-            pass
-        raise
-    
-    # Ensure audio is mono (librosa effects expect 1D array)
-    if getattr(audio, "ndim", 1) > 1:
-        audio = np.mean(audio, axis=1)
+    audio, sr = _synthesize(tts, text, speaker)
+    audio = _emotional_effects(audio, sr, emotion, global_speed, fuse=fuse_effects)
+    _write_output(output_file, audio, sr)
 
-    # Apply emotional effects based on emotion type
-    if emotion.lower() == "sad":
-        # Sad: lower pitch, slower, quieter
+    if cache_path is not None:
+        # copy under a temporary name so readers never see a partial file
+        tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
         try:
-            audio = librosa.effects.pitch_shift(audio, sr=sr, n_steps=-3)
-        except Exception:
-            pass
-        # apply time-stretch using global_speed multiplier
-        if len(audio) > sr:
+            os.makedirs(_OUTPUT_CACHE_DIR, exist_ok=True)
+            shutil.copyfile(output_file, tmp_path)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logging.warning("Could not cache output: %s", e)
+            # pruning only looks at *.wav, so never leave the partial copy
             try:
-                rate = 0.7 * float(global_speed)
-                if abs(rate - 1.0) > 0.01 and rate > 0:
-                    audio = librosa.effects.time_stretch(audio, rate=rate)
-            except Exception:
+                os.remove(tmp_path)
+            except OSError:
                 pass
-        audio = audio * 0.8  # Quieter
-        print("Applied sad emotion: lower pitch, slower speed, quieter volume")
-        
-    elif emotion.lower() == "happy":
-        # Happy: higher pitch, faster, brighter
-        audio = librosa.effects.pitch_shift(audio, sr=sr, n_steps=2)  # Higher pitch
-        try:
-            rate = 1.2 * float(global_speed)
-            if len(audio) > sr and abs(rate - 1.0) > 0.01 and rate > 0:
-                audio = librosa.effects.time_stretch(audio, rate=rate)
-        except Exception:
-            pass
-        audio = audio * 1.1  # Slightly louder
-        print("Applied happy emotion: higher pitch, faster speed, brighter tone")
-        
-    elif emotion.lower() == "angry":
-        # Angry: lower pitch, faster, louder
-        audio = librosa.effects.pitch_shift(audio, sr=sr, n_steps=-2)  # Lower pitch
-        try:
-            rate = 1.1 * float(global_speed)
-            if len(audio) > sr and abs(rate - 1.0) > 0.01 and rate > 0:
-                audio = librosa.effects.time_stretch(audio, rate=rate)
-        except Exception:
-            pass
-        audio = audio * 1.2  # Louder
-        print("Applied angry emotion: lower pitch, faster speed, louder volume")
-        
-    elif emotion.lower() == "calm":
-        # Calm: lower pitch, slower, softer
-        audio = librosa.effects.pitch_shift(audio, sr=sr, n_steps=-1)  # Slightly lower
-        try:
-            rate = 0.8 * float(global_speed)
-            if len(audio) > sr and abs(rate - 1.0) > 0.01 and rate > 0:
-                audio = librosa.effects.time_stretch(audio, rate=rate)
-        except Exception:
-            pass
-        audio = audio * 0.9  # Softer
-        print("Applied calm emotion: lower pitch, slower speed, softer volume")
-        
-    elif emotion.lower() == "excited":
-        # Excited: higher pitch, faster, louder
-        audio = librosa.effects.pitch_shift(audio, sr=sr, n_steps=3)  # Higher pitch
+        else:
+            _prune_output_cache()
+    return output_file
+
+
+def create_emotional_tts_batch(
+    texts,
+    emotions="neutral",
+    output_files=None,
+    speaker=None,
+    tts_instance=None,
+    global_speed=1.0,
+    model_name="tts_models/en/vctk/vits",
+    fuse_effects=True,
+):
+    """
+    Generate several emotional utterances with one loaded model.
+
+    emotions is either one emotion for every text or a list matching texts;
+    output_files defaults to emotional_batch_<i>_<emotion>.wav. While the
+    model synthesizes the next text, the effects and file write of the
+    previous ones run in a thread pool (librosa's FFTs release the GIL).
+
+    Returns the list of written file names, in input order.
+    """
+    texts = list(texts)
+    if isinstance(emotions, str):
+        emotions = [emotions] * len(texts)
+    if len(emotions) != len(texts):
+        raise ValueError("emotions must be a single emotion or one per text")
+    if output_files is None:
+        output_files = [f"emotional_batch_{i}_{e.lower()}.wav" for i, e in enumerate(emotions)]
+    output_files = list(output_files)
+    if len(output_files) != len(texts):
+        raise ValueError("output_files must have one file name per text")
+    # each file is written by its own thread, so names must not collide
+    if len({os.path.abspath(f) for f in output_files}) != len(output_files):
+        raise ValueError("output_files must not repeat a file name")
+
+    tts = _load_tts(tts_instance, model_name)
+    speaker = _default_speaker(tts, speaker)
+
+    def _finish(audio, sr, emotion, output_file):
+        audio = _emotional_effects(audio, sr, emotion, global_speed, fuse=fuse_effects)
+        _write_output(output_file, audio, sr)
+        return output_file
+
+    with ThreadPoolExecutor(max_workers=min(len(texts), os.cpu_count() or 1) or 1) as pool:
+        futures = []
+        for text, emotion, output_file in zip(texts, emotions, output_files):
+            audio, sr = _synthesize(tts, text, speaker)
+            futures.append(pool.submit(_finish, audio, sr, emotion, output_file))
+        return [f.result() for f in futures]
+
+
+def create_emotional_tts_streamed(
+    text,
+    emotion="neutral",
+    output_file="emotional_output.wav",
+    speaker=None,
+    tts_instance=None,
+    speaker_gender=None,
+    global_speed=1.0,
+    model_name="tts_models/en/vctk/vits",
+    fuse_effects=True,
+):
+    """
+    Like create_emotional_tts, but processes long text sentence by sentence.
+
+    A background thread synthesizes sentences into a 2-slot queue while the
+    calling thread applies the effects and appends each chunk to the output
+    file, so synthesis and post-processing overlap and only a couple of
+    sentences are held in memory at once. Speed changes are applied per
+    sentence (and skipped for sentences under a second).
+    """
+    tts = _load_tts(tts_instance, model_name)
+    speaker = _default_speaker(tts, speaker)
+    logging.info("Using speaker: %s (gender=%s)", speaker, speaker_gender)
+
+    sentences = [t for t in (t.strip() for t in _SENTENCE_RE.split(text)) if t] or [text]
+    chunks = queue.Queue(maxsize=2)
+    stop = threading.Event()
+
+    def _produce():
         try:
-            rate = 1.3 * float(global_speed)
-            if len(audio) > sr and abs(rate - 1.0) > 0.01 and rate > 0:
-                audio = librosa.effects.time_stretch(audio, rate=rate)
-        except Exception:
-            pass
-        audio = audio * 1.15  # Louder
-        print("Applied excited emotion: higher pitch, faster speed, louder volume")
-        
-    elif emotion.lower() == "whisper":
-        # Whisper: much quieter, slightly lower pitch
-        audio = librosa.effects.pitch_shift(audio, sr=sr, n_steps=-1)  # Slightly lower
-        audio = audio * 0.5  # Much quieter
-        print("Applied whisper emotion: lower pitch, much quieter volume")
-        
-    else:  # neutral
-        print("Applied neutral emotion: no modifications")
-    
-    # Prevent clipping and ensure float32
-    audio = np.asarray(audio, dtype=np.float32)
-    audio = np.clip(audio, -1.0, 1.0)
+            for sentence in sentences:
+                if stop.is_set():
+                    return
+                chunks.put(_synthesize(tts, sentence, speaker))
+        except Exception as e:
+            chunks.put(e)
+            return
+        chunks.put(None)
 
+    threading.Thread(target=_produce, daemon=True).start()
+    writer = None
     try:
-        sf.write(output_file, audio, sr, subtype='PCM_16')
-    except TypeError:
-        # older soundfile versions may not accept subtype kwarg
-        sf.write(output_file, audio, sr)
+        while True:
+            item = chunks.get()
+            if item is None:
+                break
+            if isinstance(item, Exception):
+                raise item
+            audio, sr = item
+            audio = _emotional_effects(audio, sr, emotion, global_speed, fuse=fuse_effects)
+            if writer is None:
+                writer = sf.SoundFile(
+                    output_file, mode="w", samplerate=sr, channels=1, subtype="PCM_16"
+                )
+            writer.write(_to_pcm16(audio))
+    finally:
+        # unblock the producer if we stopped early so it can see `stop`
+        stop.set()
+        while not chunks.empty():
+            chunks.get_nowait()
+        if writer is not None:
+            writer.close()
 
     logging.info("Emotional TTS saved as: %s", output_file)
+    return output_file
 
-    # cleanup temp file
-    try:
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
-    except Exception:
-        pass
+def create_emotional_variants(
+    text,
+    emotions=None,
+    output_files=None,
+    speaker=None,
+    tts_instance=None,
+    global_speed=1.0,
+    model_name="tts_models/en/vctk/vits",
+    fuse_effects=True,
+):
+    """
+    Generate the same text in several emotions from a single synthesis.
 
-    return output_file
+    The model runs once; each emotion's effects are then applied to a copy of
+    the audio in a thread pool. emotions defaults to every available emotion
+    and output_files to emotional_<emotion>.wav.
+
+    Returns the list of written file names, in the order of emotions.
+    """
+    emotions = list(emotions) if emotions is not None else list(available_emotions)
+    if output_files is None:
+        output_files = [f"emotional_{e.lower()}.wav" for e in emotions]
+    output_files = list(output_files)
+    if len(output_files) != len(emotions):
+        raise ValueError("output_files must have one file name per emotion")
+    # each file is written by its own thread, so names must not collide
+    if len({os.path.abspath(f) for f in output_files}) != len(output_files):
+        raise ValueError("output_files must not repeat a file name (check for duplicate emotions)")
+
+    tts = _load_tts(tts_instance, model_name)
+    speaker = _default_speaker(tts, speaker)
+    base_audio, sr = _synthesize(tts, text, speaker)
+
+    def _render(emotion, output_file):
+        audio = _emotional_effects(base_audio.copy(), sr, emotion, global_speed, fuse=fuse_effects)
+        _write_output(output_file, audio, sr)
+        return output_file
+
+    with ThreadPoolExecutor(max_workers=min(len(emotions), os.cpu_count() or 1) or 1) as pool:
+        return list(pool.map(_render, emotions, output_files))
 
 
 # Available emotions
 available_emotions = [
     "sad", "happy", "angry", "calm", "excited", "whisper", "neutral"
 ]
+# Lower-cased name -> emotion, for O(1) lookups of user input
+_EMOTION_BY_NAME = {e.lower(): e for e in available_emotions}
 
 
 if __name__ == "__main__":
@@ -242,9 +586,9 @@ if __name__ == "__main__":
                 print("❌ Invalid number. Using 'neutral' as default.")
         else:
             # try matching by name
-            matches = [e for e in available_emotions if e.lower() == ec]
-            if matches:
-                selected_emotion = matches[0]
+            match = _EMOTION_BY_NAME.get(ec)
+            if match:
+                selected_emotion = match
                 print(f"\n✓ Selected emotion: {selected_emotion.capitalize()}")
             else:
                 print("❌ Unknown emotion name. Using 'neutral' as default.")
@@ -259,13 +603,14 @@ if __name__ == "__main__":
     # Speaker selection: list available speakers (if any)
     tts_tmp = None
     try:
-        tts_tmp = TTS(model_name="tts_models/en/vctk/vits")
+        tts_tmp = _get_tts("tts_models/en/vctk/vits")
     except Exception:
         tts_tmp = None
 
     chosen_speaker = None
     genders_map = load_speaker_genders()
     if tts_tmp and getattr(tts_tmp, "speakers", None):
+        _SPEAKER_BY_UPPER = {s.strip().upper(): s for s in tts_tmp.speakers}
         print("Available speakers:")
         for i, sp in enumerate(tts_tmp.speakers, 1):
             key = sp.strip().upper()
@@ -279,10 +624,8 @@ if __name__ == "__main__":
                 if 0 <= idx < len(tts_tmp.speakers):
                     chosen_speaker = tts_tmp.speakers[idx]
             else:
-                # exact match
-                matches = [s for s in tts_tmp.speakers if s == spc]
-                if matches:
-                    chosen_speaker = matches[0]
+                # match by name (case-insensitive)
+                chosen_speaker = _SPEAKER_BY_UPPER.get(spc.upper())
     # If model does not expose gender metadata, ask user optionally
     speaker_gender = None
     if chosen_speaker is not None:
@@ -343,10 +686,12 @@ def generate_emotional_speech(text, emotion="neutral"):
     """
     
     # Validate emotion
-    valid_emotions = ["sad", "happy", "angry", "calm", "excited", "whisper", "neutral"]
-    if emotion.lower() not in valid_emotions:
-        print(f"❌ Invalid emotion. Using 'neutral'. Valid emotions: {valid_emotions}")
+    match = _EMOTION_BY_NAME.get(emotion.lower())
+    if match is None:
+        print(f"❌ Invalid emotion. Using 'neutral'. Valid emotions: {available_emotions}")
         emotion = "neutral"
+    else:
+        emotion = match
     
     # Create output filename
     output_file = f"emotional_{emotion}_{len(text[:20])}chars.wav"
@@ -362,9 +707,10 @@ def generate_emotional_speech(text, emotion="neutral"):
         return None
 
 
-# Example usage:
-print("📝 Example Usage:")
-print("generate_emotional_speech('Hello world!', 'happy')")
-print("generate_emotional_speech('I am so tired', 'sad')")
-print("generate_emotional_speech('This is amazing!', 'excited')")
-print("\n" + "=" * 50)
+# Example usage (printed only when run as a script, not on import):
+if __name__ == "__main__":
+    print("📝 Example Usage:")
+    print("generate_emotional_speech('Hello world!', 'happy')")
+    print("generate_emotional_speech('I am so tired', 'sad')")
+    print("generate_emotional_speech('This is amazing!', 'excited')")
+    print("\n" + "=" * 50)